@@ -18,7 +18,8 @@ enum class MessageType {
   Subscribe,    // Client -> Server: Subscribe to events
   Unsubscribe,  // Client -> Server: Unsubscribe from events
   RecordStart,  // Client -> Server: Start recording
-  RecordStop    // Client -> Server: Stop recording
+  RecordStop,   // Client -> Server: Stop recording
+  CommandBatch  // Client -> Server: Execute several commands in one frame
 };
 
 // Convert MessageType to string
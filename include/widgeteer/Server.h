@@ -155,6 +155,8 @@ private:
   // Message handling
   void handleMessage(QWebSocket* client, const QJsonObject& message);
   void handleCommand(QWebSocket* client, const QJsonObject& message);
+  void handleCommandBatch(QWebSocket* client, const QJsonObject& message);
+  Response runCommand(const Command& cmd);
   void handleTransaction(QWebSocket* client, const QJsonObject& message);
   void handleSubscribe(QWebSocket* client, const QJsonObject& message);
   void handleUnsubscribe(QWebSocket* client, const QJsonObject& message);
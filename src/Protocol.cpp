@@ -21,6 +21,8 @@ QString messageTypeToString(MessageType type) {
       return QStringLiteral("record_start");
     case MessageType::RecordStop:
       return QStringLiteral("record_stop");
+    case MessageType::CommandBatch:
+      return QStringLiteral("command_batch");
   }
   return QStringLiteral("unknown");
 }
@@ -47,6 +49,9 @@ std::optional<MessageType> stringToMessageType(const QString& str) {
   if (str == QLatin1String("record_stop")) {
     return MessageType::RecordStop;
   }
+  if (str == QLatin1String("command_batch")) {
+    return MessageType::CommandBatch;
+  }
   return std::nullopt;
 }
 
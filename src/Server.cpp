@@ -13,6 +13,8 @@
 #include <QUrlQuery>
 #include <QUuid>
 
+#include <memory>
+
 namespace widgeteer {
 namespace {
 
@@ -474,6 +476,9 @@ void Server::handleMessage(QWebSocket* client, const QJsonObject& message) {
   if (!type.has_value()) {
     QJsonObject errorResponse;
     errorResponse["type"] = messageTypeToString(MessageType::Response);
+    if (message.contains("id")) {
+      errorResponse["id"] = message.value("id");
+    }
     errorResponse["success"] = false;
     errorResponse["error"] =
         QJsonObject{ { "code", "INVALID_TYPE" },
@@ -486,6 +491,9 @@ void Server::handleMessage(QWebSocket* client, const QJsonObject& message) {
     case MessageType::Command:
       handleCommand(client, message);
       break;
+    case MessageType::CommandBatch:
+      handleCommandBatch(client, message);
+      break;
     case MessageType::Subscribe:
       handleSubscribe(client, message);
       break;
@@ -501,6 +509,9 @@ void Server::handleMessage(QWebSocket* client, const QJsonObject& message) {
     default: {
       QJsonObject errorResponse;
       errorResponse["type"] = messageTypeToString(MessageType::Response);
+      if (message.contains("id")) {
+        errorResponse["id"] = message.value("id");
+      }
       errorResponse["success"] = false;
       errorResponse["error"] =
           QJsonObject{ { "code", "INVALID_TYPE" },
@@ -532,34 +543,7 @@ void Server::handleCommand(QWebSocket* client, const QJsonObject& message) {
       return;
     }
 
-    if (loggingEnabled_) {
-      qDebug() << "Executing command:" << cmd.name;
-    }
-
-    Response result;
-    if (QThread::currentThread() == qApp->thread()) {
-      result = executor_->execute(cmd);
-    } else {
-      QMetaObject::invokeMethod(
-          qApp, [&]() { result = executor_->execute(cmd); }, Qt::BlockingQueuedConnection);
-    }
-
-    // Record the command if recording
-    if (recorder_->isRecording()) {
-      recorder_->recordCommand(cmd, result);
-    }
-
-    // Emit command_executed event if broadcasting is enabled
-    if (broadcaster_->isEnabled() && broadcaster_->hasSubscribers("command_executed")) {
-      QJsonObject eventData;
-      eventData["command"] = cmd.name;
-      eventData["params"] = cmd.params;
-      eventData["success"] = result.success;
-      eventData["duration_ms"] = result.durationMs;
-      broadcaster_->emitEvent("command_executed", eventData);
-    }
-
-    emit responseReady(cmd.id, result.success);
+    Response result = runCommand(cmd);
 
     // Check again if client is still connected before sending response
     if (!socketToClientId_.contains(client)) {
@@ -579,6 +563,106 @@ void Server::handleCommand(QWebSocket* client, const QJsonObject& message) {
   });
 }
 
+Response Server::runCommand(const Command& cmd) {
+  if (loggingEnabled_) {
+    qDebug() << "Executing command:" << cmd.name;
+  }
+
+  Response result;
+  if (QThread::currentThread() == qApp->thread()) {
+    result = executor_->execute(cmd);
+  } else {
+    QMetaObject::invokeMethod(
+        qApp, [&]() { result = executor_->execute(cmd); }, Qt::BlockingQueuedConnection);
+  }
+
+  // Record the command if recording
+  if (recorder_->isRecording()) {
+    recorder_->recordCommand(cmd, result);
+  }
+
+  // Emit command_executed event if broadcasting is enabled
+  if (broadcaster_->isEnabled() && broadcaster_->hasSubscribers("command_executed")) {
+    QJsonObject eventData;
+    eventData["command"] = cmd.name;
+    eventData["params"] = cmd.params;
+    eventData["success"] = result.success;
+    eventData["duration_ms"] = result.durationMs;
+    broadcaster_->emitEvent("command_executed", eventData);
+  }
+
+  emit responseReady(cmd.id, result.success);
+  return result;
+}
+
+void Server::handleCommandBatch(QWebSocket* client, const QJsonObject& message) {
+  const QString batchId = message.value("id").toString();
+  const QJsonArray commands = message.value("commands").toArray();
+  emit requestReceived(batchId, "command_batch");
+
+  if (loggingEnabled_) {
+    qDebug() << "Command batch:" << batchId << "commands:" << commands.size();
+  }
+
+  struct BatchState {
+    QVector<QJsonObject> results;
+    qsizetype remaining = 0;
+  };
+  auto state = std::make_shared<BatchState>();
+  state->results.resize(commands.size());
+  state->remaining = commands.size();
+
+  auto sendBatchResponse = [this, client, batchId, state]() {
+    if (!socketToClientId_.contains(client)) {
+      if (loggingEnabled_) {
+        qDebug() << "Command batch" << batchId << "completed but client disconnected";
+      }
+      return;
+    }
+
+    QJsonArray results;
+    for (const QJsonObject& result : state->results) {
+      results.append(result);
+    }
+
+    QJsonObject responseJson;
+    responseJson["type"] = messageTypeToString(MessageType::Response);
+    responseJson["id"] = batchId;
+    responseJson["success"] = true;
+    responseJson["results"] = results;
+    sendResponse(client, responseJson);
+  };
+
+  if (commands.isEmpty()) {
+    QTimer::singleShot(0, this, sendBatchResponse);
+    return;
+  }
+
+  // Each command gets its own timer, exactly as if it had arrived in its own
+  // frame, so commands after one that opens a modal dialog still execute from
+  // the dialog's nested event loop. Timers fire in order, so commands run in
+  // sequence. The single batch response, however, is only sent once every
+  // command has returned, i.e. after any modal dialog has been closed.
+  for (qsizetype i = 0; i < commands.size(); ++i) {
+    Command cmd = Command::fromJson(commands.at(i).toObject());
+    emit requestReceived(cmd.id, cmd.name);
+
+    QTimer::singleShot(0, this, [this, client, cmd, i, state, sendBatchResponse]() {
+      if (!socketToClientId_.contains(client)) {
+        if (loggingEnabled_) {
+          qDebug() << "Command" << cmd.name << "skipped: client disconnected";
+        }
+        return;
+      }
+
+      state->results[i] = runCommand(cmd).toJson();
+      if (--state->remaining == 0) {
+        sendBatchResponse();
+      }
+    });
+  }
+}
+
 void Server::handleTransaction(QWebSocket* client, const QJsonObject& message) {
   Transaction tx = Transaction::fromJson(message);
   emit requestReceived(tx.id, "transaction");
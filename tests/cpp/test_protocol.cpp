@@ -17,6 +17,7 @@ private slots:
     QCOMPARE(messageTypeToString(MessageType::Unsubscribe), QString("unsubscribe"));
     QCOMPARE(messageTypeToString(MessageType::RecordStart), QString("record_start"));
     QCOMPARE(messageTypeToString(MessageType::RecordStop), QString("record_stop"));
+    QCOMPARE(messageTypeToString(MessageType::CommandBatch), QString("command_batch"));
   }
 
   void testStringToMessageType() {
@@ -27,6 +28,7 @@ private slots:
     QCOMPARE(stringToMessageType("unsubscribe"), std::optional(MessageType::Unsubscribe));
     QCOMPARE(stringToMessageType("record_start"), std::optional(MessageType::RecordStart));
     QCOMPARE(stringToMessageType("record_stop"), std::optional(MessageType::RecordStop));
+    QCOMPARE(stringToMessageType("command_batch"), std::optional(MessageType::CommandBatch));
     QCOMPARE(stringToMessageType("invalid"), std::nullopt);
   }
 
@@ -293,6 +293,54 @@ private slots:
     server.stop();
   }
 
+  void testClientSendCommandBatch() {
+    Server server;
+    server.enableLogging(false);
+    server.setRootWidget(testWidget_);
+    QVERIFY(server.start(0));
+
+    QWebSocket client;
+    QSignalSpy clientConnectedSpy(&client, &QWebSocket::connected);
+    QSignalSpy messageReceivedSpy(&client, &QWebSocket::textMessageReceived);
+
+    QString url = QString("ws://127.0.0.1:%1").arg(server.port());
+    client.open(QUrl(url));
+    QVERIFY(clientConnectedSpy.wait(2000));
+
+    QJsonObject batch;
+    batch["type"] = "command_batch";
+    batch["id"] = "batch-1";
+    batch["commands"] = QJsonArray{
+      QJsonObject{ { "id", "cmd-1" }, { "command", "get_tree" }, { "params", QJsonObject{} } },
+      QJsonObject{ { "id", "cmd-2" },
+                   { "command", "describe" },
+                   { "params", QJsonObject{ { "target", "@name:missing" } } } }
+    };
+
+    client.sendTextMessage(QString::fromUtf8(QJsonDocument(batch).toJson()));
+    QVERIFY(messageReceivedSpy.wait(3000));
+
+    // All results arrive in a single frame, in request order
+    QCOMPARE(messageReceivedSpy.count(), 1);
+    QString response = messageReceivedSpy.at(0).at(0).toString();
+    QJsonDocument doc = QJsonDocument::fromJson(response.toUtf8());
+    QJsonObject respObj = doc.object();
+
+    QCOMPARE(respObj.value("type").toString(), QString("response"));
+    QCOMPARE(respObj.value("id").toString(), QString("batch-1"));
+    QVERIFY(respObj.value("success").toBool());
+
+    QJsonArray results = respObj.value("results").toArray();
+    QCOMPARE(results.size(), 2);
+    QCOMPARE(results.at(0).toObject().value("id").toString(), QString("cmd-1"));
+    QVERIFY(results.at(0).toObject().value("success").toBool());
+    QCOMPARE(results.at(1).toObject().value("id").toString(), QString("cmd-2"));
+    QVERIFY(!results.at(1).toObject().value("success").toBool());
+
+    client.close();
+    server.stop();
+  }
+
   void testClientSendInvalidJson() {
     Server server;
     server.enableLogging(false);
@@ -338,6 +386,7 @@ private slots:
     // Send message with invalid type
     QJsonObject msg;
     msg["type"] = "unknown_type";
+    msg["id"] = "bad-1";
     client.sendTextMessage(QString::fromUtf8(QJsonDocument(msg).toJson()));
 
     // Wait for error response
@@ -348,6 +397,39 @@ private slots:
     QVERIFY(!doc.object().value("success").toBool());
     QCOMPARE(doc.object().value("error").toObject().value("code").toString(),
              QString("INVALID_TYPE"));
+    QCOMPARE(doc.object().value("id").toString(), QString("bad-1"));
+
+    client.close();
+    server.stop();
+  }
+
+  void testClientSendUnhandledTypeEchoesId() {
+    Server server;
+    server.enableLogging(false);
+    QVERIFY(server.start(0));
+
+    QWebSocket client;
+    QSignalSpy clientConnectedSpy(&client, &QWebSocket::connected);
+    QSignalSpy messageReceivedSpy(&client, &QWebSocket::textMessageReceived);
+
+    QString url = QString("ws://127.0.0.1:%1").arg(server.port());
+    client.open(QUrl(url));
+    QVERIFY(clientConnectedSpy.wait(2000));
+
+    // A known type the server never handles from clients
+    QJsonObject msg;
+    msg["type"] = "response";
+    msg["id"] = "resp-1";
+    client.sendTextMessage(QString::fromUtf8(QJsonDocument(msg).toJson()));
+
+    QVERIFY(messageReceivedSpy.wait(2000));
+
+    QString response = messageReceivedSpy.at(0).at(0).toString();
+    QJsonDocument doc = QJsonDocument::fromJson(response.toUtf8());
+    QVERIFY(!doc.object().value("success").toBool());
+    QCOMPARE(doc.object().value("error").toObject().value("code").toString(),
+             QString("INVALID_TYPE"));
+    QCOMPARE(doc.object().value("id").toString(), QString("resp-1"));
 
     client.close();
     server.stop();
@@ -6,18 +6,113 @@ Execute tests defined in JSON files against a Widgeteer-enabled Qt application.
 """
 
 import argparse
+import asyncio
+import contextlib
+import functools
 import json
-import subprocess
+import multiprocessing
+import os
 import sys
 import time
-from dataclasses import dataclass, field
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.synchronize import Event as ProcessEvent
+from dataclasses import asdict, dataclass
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
 
-from widgeteer_client import SyncWidgeteerClient as WidgeteerClient, Response
+from widgeteer_client import WidgeteerClient, Response
 
+try:
+    # Optional: much faster parsing of large suite and results files
+    import orjson
+except ImportError:
+    orjson = None
 
-@dataclass
+
+def _json_loads(data: bytes) -> Any:
+    return orjson.loads(data) if orjson else json.loads(data)
+
+
+def _json_dumps(obj: Any) -> bytes:
+    if orjson:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2).encode()
+
+
+# Checks a step response: returns (valid, error message).
+Validator = Callable[[Response], tuple[bool, str | None]]
+
+
+# ========== Step expectations ==========
+# Each handler takes the value of its "expect" key and the step response.
+
+
+def _expect_value(expected: Any, resp: Response) -> tuple[bool, str | None]:
+    if resp.value != expected:
+        return False, f"expected value {expected!r}, got {resp.value!r}"
+    return True, None
+
+
+def _expect_value_contains(needle: Any, resp: Response) -> tuple[bool, str | None]:
+    haystack = resp.value
+    if isinstance(haystack, str):
+        if needle not in haystack:
+            return False, f"expected value to contain {needle!r}, got {haystack!r}"
+    elif isinstance(haystack, list):
+        if needle not in haystack:
+            return False, f"expected value list to contain {needle!r}, got {haystack!r}"
+    else:
+        return False, f"value_contains requires string/list value, got {type(haystack).__name__}"
+    return True, None
+
+
+def _expect_count_min(count_min: Any, resp: Response) -> tuple[bool, str | None]:
+    count = resp.data.get("count")
+    if not isinstance(count, int) or count < int(count_min):
+        return False, f"expected count >= {count_min}, got {count!r}"
+    return True, None
+
+
+def _expect_data_contains(required: Any, resp: Response) -> tuple[bool, str | None]:
+    if not isinstance(required, dict):
+        return False, "expect.data_contains must be an object"
+    for key, expected_value in required.items():
+        if key not in resp.data:
+            return False, f"expected response data to contain key {key!r}"
+        if resp.data[key] != expected_value:
+            return False, (
+                f"expected response data[{key!r}] == {expected_value!r}, "
+                f"got {resp.data[key]!r}"
+            )
+    return True, None
+
+
+def _expect_data_list_contains(requirements: Any, resp: Response) -> tuple[bool, str | None]:
+    if not isinstance(requirements, dict):
+        return False, "expect.data_list_contains must be an object"
+    for key, expected_item in requirements.items():
+        value = resp.data.get(key)
+        if not isinstance(value, list):
+            return False, f"expected response data[{key!r}] to be a list, got {type(value).__name__}"
+        # Support both flat lists ["a", "b"] and object lists [{"name": "a"}, ...]
+        found = expected_item in value
+        if not found and all(isinstance(v, dict) for v in value):
+            found = any(v.get("name") == expected_item for v in value)
+        if not found:
+            return False, f"expected response data[{key!r}] to contain {expected_item!r}"
+    return True, None
+
+
+_EXPECT_HANDLERS: dict[str, Callable[[Any, Response], tuple[bool, str | None]]] = {
+    "value": _expect_value,
+    "value_contains": _expect_value_contains,
+    "count_min": _expect_count_min,
+    "data_contains": _expect_data_contains,
+    "data_list_contains": _expect_data_list_contains,
+}
+
+
+@dataclass(slots=True)
 class TestResult:
     """Result of a single test."""
     name: str
@@ -28,128 +123,292 @@ class TestResult:
     steps_total: int = 0
 
 
-@dataclass
 class TestSuiteResult:
-    """Result of a test suite."""
-    name: str
-    results: list[TestResult] = field(default_factory=list)
+    """Result of a test suite.
+
+    Add results with add() so the pass/fail counters stay in sync.
+    """
+    __slots__ = ("name", "results", "_passed", "_failed")
+
+    def __init__(self, name: str, results: list[TestResult] | None = None):
+        self.name = name
+        self.results: list[TestResult] = []
+        self._passed = 0
+        self._failed = 0
+        for r in results or ():
+            self.add(r)
+
+    def add(self, result: TestResult) -> None:
+        self.results.append(result)
+        if result.passed:
+            self._passed += 1
+        else:
+            self._failed += 1
 
     @property
     def passed(self) -> int:
-        return sum(1 for r in self.results if r.passed)
+        return self._passed
 
     @property
     def failed(self) -> int:
-        return sum(1 for r in self.results if not r.passed)
+        return self._failed
 
     @property
     def total(self) -> int:
         return len(self.results)
 
 
+class ResultsWriter:
+    """Keep a JSON copy of suite results on disk, updated after every test.
+
+    Each write goes to a temporary file that is then renamed over the target,
+    so readers never observe a partially written file. Worker processes of a
+    --jobs run share one file and append to it under an exclusive lock file.
+    """
+
+    LOCK_TIMEOUT = 3.0
+
+    def __init__(self, path: Path, shared: bool = False):
+        self.path = Path(path)
+        self.shared = shared
+
+    def update(self, result: TestSuiteResult, test_result: TestResult) -> None:
+        """Record that test_result was just added to result."""
+        if self.shared:
+            self.append(result.name, test_result)
+        else:
+            self.write(result)
+
+    def write(self, result: TestSuiteResult) -> None:
+        """Replace the file with the full suite result."""
+        self._replace(_suite_to_dict(result.name, [asdict(r) for r in result.results],
+                                     result.passed))
+
+    def append(self, name: str, test_result: TestResult) -> None:
+        """Add a single test result to the file, under the lock."""
+        locked = self._acquire_lock()
+        try:
+            try:
+                with open(self.path, "rb") as f:
+                    results = _json_loads(f.read()).get("results", [])
+            except (OSError, ValueError):
+                results = []
+            results.append(asdict(test_result))
+            passed = sum(1 for r in results if r["passed"])
+            self._replace(_suite_to_dict(name, results, passed))
+        finally:
+            if locked:
+                os.unlink(self._lock_path)
+
+    @property
+    def _lock_path(self) -> str:
+        return f"{self.path}.lock"
+
+    def _acquire_lock(self) -> bool:
+        """Spin on an O_EXCL lock file. Returns False if it timed out."""
+        deadline = time.monotonic() + self.LOCK_TIMEOUT
+        while True:
+            try:
+                os.close(os.open(self._lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+                return True
+            except FileExistsError:
+                if time.monotonic() >= deadline:
+                    # A crashed worker may have left the lock behind; write anyway.
+                    return False
+                time.sleep(0.01)
+
+    def _replace(self, doc: dict) -> None:
+        tmp = f"{self.path}.tmp.{os.getpid()}"
+        with open(tmp, "wb") as f:
+            f.write(_json_dumps(doc))
+        os.replace(tmp, self.path)
+
+
+def _suite_to_dict(name: str, results: list[dict], passed: int) -> dict:
+    return {
+        "name": name,
+        "passed": passed,
+        "failed": len(results) - passed,
+        "total": len(results),
+        "results": results,
+    }
+
+
+class ClientPool:
+    """Connected clients handed out to concurrently running tests."""
+
+    def __init__(self, clients: list[WidgeteerClient]):
+        self._clients = clients
+        self._idle: asyncio.Queue[WidgeteerClient] = asyncio.Queue()
+        for client in clients:
+            self._idle.put_nowait(client)
+
+    @classmethod
+    async def open(cls, host: str, port: int, token: str | None, size: int) -> "ClientPool":
+        """Open size connections up front."""
+        clients = [WidgeteerClient(host=host, port=port, token=token) for _ in range(size)]
+        await asyncio.gather(*(client.connect() for client in clients))
+        return cls(clients)
+
+    @contextlib.asynccontextmanager
+    async def acquire(self):
+        """Check a client out for the duration of the block."""
+        client = await self._idle.get()
+        try:
+            yield client
+        finally:
+            self._idle.put_nowait(client)
+
+    async def close(self) -> None:
+        await asyncio.gather(*(client.disconnect() for client in self._clients),
+                             return_exceptions=True)
+
+
 class TestExecutor:
     """Execute tests from JSON files."""
 
-    def __init__(self, client: WidgeteerClient, verbose: bool = False):
+    def __init__(self, client: WidgeteerClient, verbose: bool = False, jobs: int = 1,
+                 shard: tuple[int, int] | None = None, results: ResultsWriter | None = None,
+                 fail_fast: bool = False, pool: ClientPool | None = None,
+                 stop_event: ProcessEvent | None = None):
+        """
+        Args:
+            client: Connected client used for setup, teardown and (with jobs=1) tests.
+            verbose: Print every step.
+            jobs: Number of worker processes to deal tests to. Each worker opens
+                its own connection; setup and teardown still run once, here.
+            shard: Optional (index, count) pair, 1-based, restricting the run to
+                every count-th test starting at index (for CI matrices).
+            results: Optional writer that saves results to disk after every test.
+            fail_fast: Stop at the first failing test, cancelling concurrent ones.
+            pool: Optional pool of extra connections; each running test checks
+                one out, so concurrent tests don't share a socket.
+            stop_event: Optional event shared with other worker processes. With
+                fail_fast it is set on the first failure, and no new tests start
+                once any worker has set it.
+        """
         self.client = client
         self.verbose = verbose
+        self.jobs = jobs
+        self.shard = shard
+        self.results = results
+        self.fail_fast = fail_fast
+        self.pool = pool
+        self.stop_event = stop_event
+        self._validators: dict[int, tuple[dict, list[Validator]]] = {}
+
+    def _acquire_client(self):
+        """Context manager yielding the client a test should run on."""
+        if self.pool:
+            return self.pool.acquire()
+        return contextlib.nullcontext(self.client)
+
+    def add_result(self, result: TestSuiteResult, test_result: TestResult) -> None:
+        """Append a test result and update the on-disk results, if enabled."""
+        result.add(test_result)
+        if self.results:
+            self.results.update(result, test_result)
 
     def log(self, message: str):
         """Log a message if verbose mode is enabled."""
         if self.verbose:
             print(f"  {message}")
 
-    def execute_step(self, step: dict) -> Response:
-        """Execute a single test step."""
+    async def execute_step(self, step: dict, client: WidgeteerClient | None = None) -> Response:
+        """Execute a single test step (on client, if given, else self.client)."""
         command = step.get("command")
         params = step.get("params", {})
 
-        self.log(f"  -> {command}: {params.get('target', params)}")
+        # Guarded here so the message isn't even formatted when not verbose.
+        if self.verbose:
+            self.log(f"  -> {command}: {params.get('target', params)}")
 
-        return self.client.command(command, params)
+        return await (client or self.client).command(command, params)
 
     def check_step_result(self, step: dict, resp: Response) -> tuple[bool, str | None]:
         """Validate semantic success for a step response."""
+        # Validators are compiled once per step and reused on every run. The
+        # cache holds the step itself so its id() cannot be reused meanwhile.
+        cached = self._validators.get(id(step))
+        if cached is None or cached[0] is not step:
+            cached = self._validators[id(step)] = (step, self._compile_step(step))
+
+        for validator in cached[1]:
+            valid, error = validator(resp)
+            if not valid:
+                return False, error
+        return True, None
+
+    def _compile_step(self, step: dict) -> list[Validator]:
+        """Turn a step's expectations into a list of response validators."""
         command = step.get("command")
         target = step.get("params", {}).get("target")
         expect = step.get("expect")
+        validators: list[Validator] = []
 
         # When an explicit expect block is present it takes full control of
         # validation, so skip the default boolean / assert heuristics.
         if expect is None:
             # Boolean checks should fail the step when false.
-            if command in ("exists", "is_visible") and not bool(resp.value):
-                return False, f"{command} returned false for target {target}"
+            if command in ("exists", "is_visible"):
+                def check_true(resp: Response) -> tuple[bool, str | None]:
+                    if not bool(resp.value):
+                        return False, f"{command} returned false for target {target}"
+                    return True, None
+                validators.append(check_true)
 
             # Assert command reports pass/fail in payload, not in top-level success.
-            if command == "assert" and not bool(resp.value):
-                actual = resp.data.get("actual")
-                expected = resp.data.get("expected")
-                operator = resp.data.get("operator")
-                prop = resp.data.get("property")
-                return False, f"assert failed: {prop} {operator} {expected}, got {actual}"
-
-            return True, None
-
-        if "value" in expect and resp.value != expect["value"]:
-            return False, f"expected value {expect['value']!r}, got {resp.value!r}"
-
-        if "value_contains" in expect:
-            needle = expect["value_contains"]
-            haystack = resp.value
-            if isinstance(haystack, str):
-                if needle not in haystack:
-                    return False, f"expected value to contain {needle!r}, got {haystack!r}"
-            elif isinstance(haystack, list):
-                if needle not in haystack:
-                    return False, f"expected value list to contain {needle!r}, got {haystack!r}"
-            else:
-                return False, f"value_contains requires string/list value, got {type(haystack).__name__}"
-
-        if "count_min" in expect:
-            count = resp.data.get("count")
-            if not isinstance(count, int) or count < int(expect["count_min"]):
-                return False, f"expected count >= {expect['count_min']}, got {count!r}"
-
-        if "data_contains" in expect:
-            required = expect["data_contains"]
-            if not isinstance(required, dict):
-                return False, "expect.data_contains must be an object"
-            for key, expected_value in required.items():
-                if key not in resp.data:
-                    return False, f"expected response data to contain key {key!r}"
-                if resp.data[key] != expected_value:
-                    return False, (
-                        f"expected response data[{key!r}] == {expected_value!r}, "
-                        f"got {resp.data[key]!r}"
-                    )
-
-        if "data_list_contains" in expect:
-            requirements = expect["data_list_contains"]
-            if not isinstance(requirements, dict):
-                return False, "expect.data_list_contains must be an object"
-            for key, expected_item in requirements.items():
-                value = resp.data.get(key)
-                if not isinstance(value, list):
-                    return False, f"expected response data[{key!r}] to be a list, got {type(value).__name__}"
-                # Support both flat lists ["a", "b"] and object lists [{"name": "a"}, ...]
-                found = expected_item in value
-                if not found and all(isinstance(v, dict) for v in value):
-                    found = any(v.get("name") == expected_item for v in value)
-                if not found:
-                    return False, f"expected response data[{key!r}] to contain {expected_item!r}"
-
-        return True, None
-
-    def check_assertion(self, assertion: dict) -> tuple[bool, str | None]:
-        """Check an assertion."""
-        target = assertion.get("target")
+            if command == "assert":
+                def check_assert(resp: Response) -> tuple[bool, str | None]:
+                    if not bool(resp.value):
+                        actual = resp.data.get("actual")
+                        expected = resp.data.get("expected")
+                        operator = resp.data.get("operator")
+                        prop = resp.data.get("property")
+                        return False, f"assert failed: {prop} {operator} {expected}, got {actual}"
+                    return True, None
+                validators.append(check_assert)
+
+            return validators
+
+        # Only the keys actually present are looked at; unknown keys are ignored.
+        # Checks run in the order the keys appear in the step's expect block,
+        # so with several failures the first one listed is the one reported.
+        for key, expected in expect.items():
+            handler = _EXPECT_HANDLERS.get(key)
+            if handler is not None:
+                validators.append(functools.partial(handler, expected))
+
+        return validators
+
+    async def check_assertions(self, assertions: list[dict],
+                               client: WidgeteerClient | None = None) -> str | None:
+        """Check all assertions in a single batch. Returns the first error, if any."""
+        responses = await (client or self.client).batch([
+            {
+                "command": "assert",
+                "params": {
+                    "target": assertion.get("target"),
+                    "property": assertion.get("property"),
+                    "operator": assertion.get("operator", "=="),
+                    "value": assertion.get("value"),
+                },
+            }
+            for assertion in assertions
+        ])
+
+        for assertion, resp in zip(assertions, responses):
+            passed, err = self.check_assertion(assertion, resp)
+            if not passed:
+                return err
+        return None
+
+    def check_assertion(self, assertion: dict, resp: Response) -> tuple[bool, str | None]:
+        """Check the server's response to an assertion."""
         property_name = assertion.get("property")
         operator = assertion.get("operator", "==")
         expected = assertion.get("value")
 
-        resp = self.client.assert_property(target, property_name, operator, expected)
-
         if not resp.success:
             return False, resp.error
 
@@ -161,47 +420,100 @@ class TestExecutor:
 
         return True, None
 
-    def run_test(self, test: dict) -> TestResult:
-        """Run a single test."""
-        name = test.get("name", "unnamed")
-        steps = test.get("steps", [])
-        assertions = test.get("assertions", [])
+    async def execute_batch(self, steps: list[dict],
+                            client: WidgeteerClient | None = None) -> list[Response]:
+        """Execute several steps in a single round trip."""
+        if self.verbose:
+            for step in steps:
+                params = step.get("params", {})
+                self.log(f"  -> {step.get('command')} [batch {step.get('batch_group')}]: "
+                         f"{params.get('target', params)}")
 
-        start_time = time.time()
+        return await (client or self.client).batch_commands(
+            *((step.get("command"), step.get("params", {})) for step in steps))
+
+    async def run_steps(self, steps: list[dict],
+                        client: WidgeteerClient | None = None) -> tuple[int, str | None]:
+        """Run steps one after another, stopping at the first failure.
+
+        Consecutive steps sharing a ``batch_group`` are sent together in one
+        batch; they all execute even if an earlier one in the batch fails.
+
+        Returns the number of completed steps and the error (if any).
+        """
         steps_completed = 0
-        error = None
+        for group in _group_batched(steps):
+            if len(group) > 1:
+                responses = await self.execute_batch(group, client)
+            else:
+                responses = [await self.execute_step(group[0], client)]
 
-        self.log(f"Running test: {name}")
+            steps_completed, error = self.check_responses(group, responses, steps_completed)
+            if error is not None:
+                return steps_completed, error
 
-        # Execute steps
-        for i, step in enumerate(steps):
-            resp = self.execute_step(step)
+            # Optional delay between steps (after the whole batch, if batched)
+            delay = group[-1].get("delay_ms")
+            if delay:
+                await asyncio.sleep(delay / 1000.0)
+
+        return steps_completed, None
+
+    async def run_steps_parallel(self, steps: list[dict],
+                                 client: WidgeteerClient | None = None) -> tuple[int, str | None]:
+        """Send all steps at once and validate the responses in order.
+
+        Only valid for tests marked ``"parallel": true``, i.e. whose steps do
+        not depend on each other. ``delay_ms`` is ignored in this mode.
+        """
+        responses = await asyncio.gather(*(self.execute_step(step, client) for step in steps))
 
+        return self.check_responses(steps, responses)
+
+    def check_responses(self, steps: list[dict], responses: list[Response],
+                        steps_completed: int = 0) -> tuple[int, str | None]:
+        """Validate step responses in order, stopping at the first failure.
+
+        Returns the updated steps_completed count and the error (if any).
+        """
+        for step, resp in zip(steps, responses):
             if not resp.success:
-                error = f"Step {i+1} failed: {resp.error}"
-                break
+                return steps_completed, f"Step {steps_completed + 1} failed: {resp.error}"
 
             valid, step_error = self.check_step_result(step, resp)
             if not valid:
-                error = f"Step {i+1} failed: {step_error}"
-                break
+                return steps_completed, f"Step {steps_completed + 1} failed: {step_error}"
 
             steps_completed += 1
 
-            # Optional delay between steps
-            delay = step.get("delay_ms")
-            if delay:
-                time.sleep(delay / 1000.0)
+        return steps_completed, None
+
+    async def run_test(self, test: dict) -> TestResult:
+        """Run a single test."""
+        name = test.get("name", "unnamed")
+        steps = test.get("steps", [])
+        assertions = test.get("assertions", [])
+
+        start_time = time.perf_counter()
+
+        if self.verbose:
+            self.log(f"Running test: {name}")
 
-        # Run assertions if all steps passed
-        if error is None:
-            for assertion in assertions:
-                passed, err = self.check_assertion(assertion)
-                if not passed:
+        async with self._acquire_client() as client:
+            # Execute steps
+            if test.get("parallel"):
+                steps_completed, error = await self.run_steps_parallel(steps, client)
+            else:
+                steps_completed, error = await self.run_steps(steps, client)
+
+            # Run assertions if all steps passed. Assertions only read state, so
+            # they are all sent in one round trip.
+            if error is None and assertions:
+                err = await self.check_assertions(assertions, client)
+                if err is not None:
                     error = f"Assertion failed: {err}"
-                    break
 
-        duration_ms = (time.time() - start_time) * 1000
+        duration_ms = (time.perf_counter() - start_time) * 1000
 
         return TestResult(
             name=name,
@@ -212,15 +524,22 @@ class TestExecutor:
             steps_total=len(steps)
         )
 
-    def run_suite(self, suite: dict) -> TestSuiteResult:
+    async def run_suite(self, suite: dict) -> TestSuiteResult:
         """Run a test suite."""
         name = suite.get("name", "unnamed")
         tests = suite.get("tests", [])
+        if self.shard:
+            index, count = self.shard
+            tests = shard_tests(tests, index - 1, count)
         setup = suite.get("setup", [])
         teardown = suite.get("teardown", [])
 
         result = TestSuiteResult(name=name)
 
+        # Compile step expectations up front rather than on first use.
+        for step in (*setup, *(step for test in tests for step in test.get("steps", []))):
+            self._validators[id(step)] = (step, self._compile_step(step))
+
         print(f"\n{'='*60}")
         print(f"Test Suite: {name}")
         print('='*60)
@@ -229,10 +548,10 @@ class TestExecutor:
         if setup:
             self.log("Running setup...")
             for i, step in enumerate(setup):
-                resp = self.execute_step(step)
+                resp = await self.execute_step(step)
                 if not resp.success:
                     print(f"Setup failed (step {i+1}): {resp.error}")
-                    result.results.append(TestResult(
+                    self.add_result(result, TestResult(
                         name="__setup__",
                         passed=False,
                         duration_ms=0.0,
@@ -244,7 +563,7 @@ class TestExecutor:
                 valid, step_error = self.check_step_result(step, resp)
                 if not valid:
                     print(f"Setup failed (step {i+1}): {step_error}")
-                    result.results.append(TestResult(
+                    self.add_result(result, TestResult(
                         name="__setup__",
                         passed=False,
                         duration_ms=0.0,
@@ -255,51 +574,291 @@ class TestExecutor:
                     return result
 
         # Run tests
-        for test in tests:
-            test_result = self.run_test(test)
-            result.results.append(test_result)
-
-            status = "✓ PASS" if test_result.passed else "✗ FAIL"
-            print(f"  {status} {test_result.name} ({test_result.duration_ms:.1f}ms)")
-            if test_result.error:
-                print(f"       Error: {test_result.error}")
+        if self.jobs > 1 and len(tests) > 1:
+            await self.run_tests_sharded(tests, result)
+        else:
+            await self.run_tests(tests, result)
 
         # Run teardown
         if teardown:
             self.log("Running teardown...")
             for step in teardown:
-                self.execute_step(step)
+                await self.execute_step(step)
 
         return result
 
-    def run_file(self, path: Path) -> TestSuiteResult:
+    async def run_tests(self, tests: list[dict],
+                        result: TestSuiteResult) -> list[TestResult | None]:
+        """Run tests on this executor's client, appending to result.
+
+        Returns one entry per test in tests, in order: its result, or None if
+        it was not run (cancelled or skipped by fail_fast).
+        """
+        outcomes: list[TestResult | None] = [None] * len(tests)
+        position = 0
+        # Consecutive tests marked "independent" do not rely on state left by
+        # other tests, so each such run is executed concurrently.
+        for group in _group_independent(tests):
+            if self.stop_event is not None and self.stop_event.is_set():
+                print("  Stopping after a failure in another worker (--fail-fast)")
+                break
+
+            if len(group) > 1:
+                test_results = await self.run_tests_concurrently(group)
+            else:
+                test_results = [await self.run_test(group[0])]
+            outcomes[position:position + len(group)] = test_results
+            position += len(group)
+
+            for test_result in test_results:
+                if test_result is None:
+                    continue
+                self.add_result(result, test_result)
+
+                status = "✓ PASS" if test_result.passed else "✗ FAIL"
+                print(f"  {status} {test_result.name} ({test_result.duration_ms:.1f}ms)")
+                if test_result.error:
+                    print(f"       Error: {test_result.error}")
+
+            if self.fail_fast and not all(r is None or r.passed for r in test_results):
+                if self.stop_event is not None:
+                    self.stop_event.set()
+                print("  Stopping after first failure (--fail-fast)")
+                break
+
+        return outcomes
+
+    async def run_tests_concurrently(self, tests: list[dict]) -> list[TestResult | None]:
+        """Run tests concurrently, returning their results in test order.
+
+        With fail_fast, tests still in flight when one fails are cancelled and
+        reported as None.
+        """
+        if not self.fail_fast:
+            return list(await asyncio.gather(*(self.run_test(t) for t in tests)))
+
+        tasks = [asyncio.ensure_future(self.run_test(t)) for t in tests]
+        pending = set(tasks)
+        while pending:
+            # run_test reports failures as results, so wake up on every
+            # completion rather than only on exceptions.
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            if any(t.exception() is not None or not t.result().passed for t in done):
+                break
+
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        return [None if t.cancelled() else t.result() for t in tasks]
+
+    async def run_tests_sharded(self, tests: list[dict], result: TestSuiteResult) -> None:
+        """Deal tests round-robin to worker processes and merge their results."""
+        jobs = min(self.jobs, len(tests))
+        loop = asyncio.get_running_loop()
+        client = self.client
+        results_path = None
+        if self.results:
+            # Workers append to the file as they go; start it from what we have.
+            self.results.write(result)
+            results_path = self.results.path
+
+        # With fail_fast, a failure in any worker stops the others too.
+        mp_context = multiprocessing.get_context()
+        stop_event = mp_context.Event() if self.fail_fast else None
+        with ProcessPoolExecutor(max_workers=jobs, mp_context=mp_context,
+                                 initializer=_init_shard_worker,
+                                 initargs=(stop_event,)) as pool:
+            shard_outcomes = await asyncio.gather(*(
+                loop.run_in_executor(pool, _run_shard, client.host, client.port, client.token,
+                                     shard_tests(tests, i, jobs), self.verbose, result.name,
+                                     results_path, self.fail_fast)
+                for i in range(jobs)
+            ))
+
+        # Restore file order: test k ran as item k // jobs of shard k % jobs.
+        # Tests that were not run have None in their slot.
+        for k in range(len(tests)):
+            test_result = shard_outcomes[k % jobs][k // jobs]
+            if test_result is not None:
+                result.add(test_result)
+        if self.results:
+            self.results.write(result)
+
+    async def run_file(self, path: Path) -> TestSuiteResult:
         """Run tests from a JSON file."""
-        with open(path) as f:
-            suite = json.load(f)
+        return await self.run_suite(load_suite(path))
+
+
+def load_suite(path: Path) -> dict:
+    """Load a test suite, reusing the parsed result while the file is unchanged.
+
+    The returned dict is shared between callers and must not be modified.
+    """
+    return _load_suite(str(path), path.stat().st_mtime_ns)
+
+
+@functools.lru_cache(maxsize=32)
+def _load_suite(path: str, mtime_ns: int) -> dict:
+    with open(path, "rb") as f:
+        return _json_loads(f.read())
+
+
+def shard_tests(tests: list[dict], index: int, count: int) -> list[dict]:
+    """Return the tests of shard index (0-based) out of count, dealt by position."""
+    return tests[index::count]
+
+
+def parse_shard(value: str) -> tuple[int, int]:
+    """Parse a 1-based "i/N" shard spec for argparse."""
+    try:
+        index, count = (int(part) for part in value.split("/"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"shard must look like i/N, got {value!r}")
+    if count < 1 or not 1 <= index <= count:
+        raise argparse.ArgumentTypeError(f"shard index must be in 1..N, got {value!r}")
+    return index, count
+
+
+# Fail-fast event shared by the worker processes of a sharded run
+_shard_stop_event: ProcessEvent | None = None
+
+
+def _init_shard_worker(stop_event: ProcessEvent | None) -> None:
+    """Worker process initializer: keep the shared fail-fast event."""
+    global _shard_stop_event
+    _shard_stop_event = stop_event
 
-        return self.run_suite(suite)
 
+def _run_shard(host: str, port: int, token: str | None, tests: list[dict], verbose: bool,
+               suite_name: str, results_path: Path | None,
+               fail_fast: bool) -> list[TestResult | None]:
+    """Worker process entry point: run tests on a fresh connection.
 
-def wait_for_server(client: WidgeteerClient, timeout: float = 10.0) -> bool:
-    """Wait for server to become available."""
-    start = time.time()
-    while time.time() - start < timeout:
+    Returns one entry per test, None for tests that were not run.
+    """
+    async def run() -> list[TestResult | None]:
+        client = WidgeteerClient(host=host, port=port, token=token)
+        await client.connect()
         try:
-            client.connect()
+            result = TestSuiteResult(name=suite_name)
+            results = ResultsWriter(results_path, shared=True) if results_path else None
+            executor = TestExecutor(client, verbose=verbose, results=results, fail_fast=fail_fast,
+                                    stop_event=_shard_stop_event)
+            return await executor.run_tests(tests, result)
+        finally:
+            await client.disconnect()
+
+    return asyncio.run(run())
+
+
+def _group_batched(steps: list[dict]) -> list[list[dict]]:
+    """Split steps into runs of consecutive steps with the same ``batch_group``.
+
+    Steps without a batch_group are each a group of their own.
+    """
+    groups: list[list[dict]] = []
+    for step in steps:
+        batch_group = step.get("batch_group")
+        if batch_group is not None and groups and groups[-1][-1].get("batch_group") == batch_group:
+            groups[-1].append(step)
+        else:
+            groups.append([step])
+    return groups
+
+
+def _group_independent(tests: list[dict]) -> list[list[dict]]:
+    """Split tests into groups that can each be run concurrently.
+
+    Consecutive tests marked ``"independent": true`` form a single group;
+    every other test is a group of its own. Group order follows file order.
+    """
+    groups: list[list[dict]] = []
+    for test in tests:
+        if test.get("independent") and groups and groups[-1][-1].get("independent"):
+            groups[-1].append(test)
+        else:
+            groups.append([test])
+    return groups
+
+
+async def wait_for_port(host: str, port: int, timeout: float) -> bool:
+    """Poll every 20ms until something accepts TCP connections on host:port."""
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        try:
+            _, writer = await asyncio.wait_for(asyncio.open_connection(host, port), 0.05)
+        except (OSError, asyncio.TimeoutError):
+            await asyncio.sleep(0.02)
+            continue
+        writer.close()
+        await writer.wait_closed()
+        return True
+    return False
+
+
+async def wait_for_server(client: WidgeteerClient, timeout: float = 10.0) -> bool:
+    """Wait for server to become available.
+
+    The connection is opened once and reused for every probe; it is only
+    re-established if it was refused, dropped, or a probe on it failed.
+    """
+    start = time.perf_counter()
+    connected = False
+    while time.perf_counter() - start < timeout:
+        try:
+            if not connected:
+                await client.connect()
+                connected = True
             # Try a simple command to verify connection works
-            resp = client.tree(depth=0)
+            resp = await client.tree(depth=0)
             if resp.success:
                 return True
-            client.disconnect()
         except Exception:
-            try:
-                client.disconnect()
-            except Exception:
-                pass
-        time.sleep(0.5)
+            # Refused, or anything going wrong on an open connection (including
+            # a clean close): start over with a fresh connection.
+            if connected:
+                try:
+                    await client.disconnect()
+                except Exception:
+                    pass
+                connected = False
+        await asyncio.sleep(0.1)
+    if connected:
+        await client.disconnect()
     return False
 
 
+async def shutdown_app(client: WidgeteerClient, app_process: asyncio.subprocess.Process) -> None:
+    """Stop the launched application, escalating from quit to SIGTERM to SIGKILL."""
+    # Send quit command for graceful shutdown (allows gcov to flush coverage data)
+    try:
+        await asyncio.wait_for(client.quit(), timeout=1.0)
+    except Exception:
+        pass  # Fall back to signals below
+    if not await _wait_process(app_process, 2.0):
+        await terminate_app(app_process)
+
+
+async def terminate_app(app_process: asyncio.subprocess.Process) -> None:
+    """Send SIGTERM, then SIGKILL if the process is still alive after 0.5s."""
+    for stop in (app_process.terminate, app_process.kill):
+        try:
+            stop()
+        except ProcessLookupError:
+            return  # Already gone
+        if await _wait_process(app_process, 0.5):
+            return
+
+
+async def _wait_process(process: asyncio.subprocess.Process, timeout: float) -> bool:
+    """Wait up to timeout seconds for process to exit. Returns whether it did."""
+    try:
+        await asyncio.wait_for(process.wait(), timeout=timeout)
+        return True
+    except asyncio.TimeoutError:
+        return False
+
+
 def main():
     parser = argparse.ArgumentParser(description="Widgeteer Test Executor")
     parser.add_argument("test_file", type=Path, nargs="?",
@@ -316,25 +875,54 @@ def main():
                         help="Verbose output")
     parser.add_argument("--list-tests", action="store_true",
                         help="List tests in file without running")
+    parser.add_argument("--jobs", "-j", type=int, default=1,
+                        help="Worker processes to run tests in, each with its own "
+                             "connection (0 = CPU count - 2; default: 1)")
+    parser.add_argument("--shard", type=parse_shard, metavar="I/N",
+                        help="Only run shard I of N (1-based), e.g. for CI matrices")
+    parser.add_argument("--results-json", type=Path, metavar="PATH",
+                        help="Write results to PATH as JSON, updated after every test")
+    parser.add_argument("--fail-fast", "-x", action="store_true",
+                        help="Stop at the first failing test; with --jobs, other "
+                             "workers stop before starting their next test")
+    parser.add_argument("--connections", type=int, default=1,
+                        help="Connections shared by concurrently running independent "
+                             "tests (default: 1)")
 
     args = parser.parse_args()
+    if args.jobs <= 0:
+        args.jobs = max(1, (os.cpu_count() or 1) - 2)
+    sys.exit(asyncio.run(run(args)))
+
 
+async def run(args: argparse.Namespace) -> int:
+    """Connect to the server and run the requested action. Returns the exit code."""
     client = WidgeteerClient(host=args.host, port=args.port)
     app_process = None
+    pool = None
+
+    deadline = time.perf_counter() + args.wait
 
     # Launch application if specified
     if args.app:
         print(f"Launching application: {args.app}")
-        app_process = subprocess.Popen([str(args.app), str(args.port)])
-        time.sleep(1)  # Give it time to start
-
-    # Wait for server
+        # Own session so terminal signals aimed at us don't hit the app first;
+        # shutdown is handled explicitly below.
+        app_process = await asyncio.create_subprocess_exec(
+            str(args.app), str(args.port), start_new_session=True, close_fds=True)
+        if not await wait_for_port(args.host, args.port, args.wait):
+            print("Error: Server not available")
+            await terminate_app(app_process)
+            return 1
+
+    # Wait for server within what is left of the --wait budget, allowing at
+    # least one probe if the port only just opened
     print(f"Connecting to Widgeteer server at {args.host}:{args.port}...")
-    if not wait_for_server(client, args.wait):
+    if not await wait_for_server(client, max(deadline - time.perf_counter(), 1.0)):
         print("Error: Server not available")
         if app_process:
-            app_process.terminate()
-        sys.exit(1)
+            await terminate_app(app_process)
+        return 1
 
     print("Connected!")
 
@@ -342,42 +930,45 @@ def main():
         if args.test_file:
             if args.list_tests:
                 # List tests only
-                with open(args.test_file) as f:
-                    suite = json.load(f)
+                suite = load_suite(args.test_file)
                 print(f"\nTests in {args.test_file}:")
                 for test in suite.get("tests", []):
                     print(f"  - {test.get('name', 'unnamed')}")
             else:
                 # Run tests
-                executor = TestExecutor(client, verbose=args.verbose)
-                result = executor.run_file(args.test_file)
+                results = ResultsWriter(args.results_json) if args.results_json else None
+                if args.connections > 1:
+                    pool = await ClientPool.open(args.host, args.port, client.token,
+                                                 args.connections)
+                executor = TestExecutor(client, verbose=args.verbose, jobs=args.jobs,
+                                        shard=args.shard, results=results,
+                                        fail_fast=args.fail_fast, pool=pool)
+                result = await executor.run_file(args.test_file)
 
                 print(f"\n{'='*60}")
                 print(f"Results: {result.passed}/{result.total} passed")
                 print('='*60)
 
                 if result.failed > 0:
-                    sys.exit(1)
+                    return 1
         else:
             # No test file - just check connection and print tree
             print("\nWidget tree:")
-            resp = client.tree(depth=2)
+            resp = await client.tree(depth=2)
             if resp.success:
                 print(json.dumps(resp.data, indent=2)[:1000])
             else:
                 print(f"Error: {resp.error}")
 
     finally:
+        if pool:
+            await pool.close()
         if app_process:
             print("\nTerminating application...")
-            # Send quit command for graceful shutdown (allows gcov to flush coverage data)
-            try:
-                client.quit()
-                app_process.wait(timeout=5)
-            except Exception:
-                # Fall back to SIGTERM if quit command fails
-                app_process.terminate()
-                app_process.wait(timeout=5)
+            await shutdown_app(client, app_process)
+        await client.disconnect()
+
+    return 0
 
 
 if __name__ == "__main__":
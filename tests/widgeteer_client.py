@@ -7,44 +7,90 @@ using WebSocket communication.
 """
 
 import asyncio
+import atexit
+import itertools
 import json
 import re
-import uuid
+import threading
+import time
+from contextlib import contextmanager
 from dataclasses import dataclass, field
-from typing import Any, Callable
-from urllib.parse import urlencode
+from functools import lru_cache, partial
+from typing import Any, Awaitable, Callable, Iterator
+from urllib.parse import quote_plus
 
 try:
     import websockets
     # Try newer websockets 13+ API first
     try:
         from websockets.asyncio.client import connect as ws_connect
+        _NEW_WS_API = True
     except (ImportError, ModuleNotFoundError):
         # Fall back to websockets 12.x and earlier
         from websockets import connect as ws_connect
+        _NEW_WS_API = False
 except ImportError:
     websockets = None
+    _NEW_WS_API = False
+
+try:
+    # Optional: blocking transport for SyncWidgeteerClient (websocket-client)
+    import websocket as ws_blocking
+except ImportError:
+    ws_blocking = None
+
+try:
+    # Optional: faster event loop for SyncWidgeteerClient (not on Windows)
+    import uvloop
+except ImportError:
+    uvloop = None
+
+try:
+    # Optional: faster encoding/decoding of messages and events
+    import orjson
+except ImportError:
+    orjson = None
+
+if orjson:
+    _loads = orjson.loads
+
+    def _dumps(obj: Any) -> str:
+        # The server only accepts text frames
+        return orjson.dumps(obj).decode()
+else:
+    _loads = json.loads
+    _dumps = json.dumps
+
+# orjson parses UTF-8 bytes directly, so skip decoding text frames to str
+# when the websockets API allows it (recv(decode=False), 13+)
+_RECV_BYTES = orjson is not None and _NEW_WS_API
 
 
 # ========== Selector Syntax ==========
 
-# Regex patterns for CSS-like selector syntax
-_SELECTOR_PATTERNS = [
+# Single pattern for CSS-like selector syntax; the matching group decides
+# the native prefix, so each segment is scanned once.
+_SELECTOR_RE = re.compile(
     # #name -> @name:name (by objectName, like CSS id)
-    (re.compile(r'^#([a-zA-Z_][a-zA-Z0-9_]*)$'), r'@name:\1'),
+    r'^(?:#(?P<id>[a-zA-Z_][a-zA-Z0-9_]*)'
     # .ClassName -> @class:ClassName (by Qt class)
-    (re.compile(r'^\.([a-zA-Z_][a-zA-Z0-9_]*)$'), r'@class:\1'),
-    # [text="value"] or [text='value'] -> @text:value
-    (re.compile(r'^\[text=["\'](.+)["\']\]$'), r'@text:\1'),
-    # [accessible="value"] or [accessible='value'] -> @accessible:value
-    (re.compile(r'^\[accessible=["\'](.+)["\']\]$'), r'@accessible:\1'),
-    # [name="value"] -> @name:value (alternative attribute syntax)
-    (re.compile(r'^\[name=["\'](.+)["\']\]$'), r'@name:\1'),
-    # [class="value"] -> @class:value (alternative attribute syntax)
-    (re.compile(r'^\[class=["\'](.+)["\']\]$'), r'@class:\1'),
-]
+    r'|\.(?P<cls>[a-zA-Z_][a-zA-Z0-9_]*)'
+    # [text="value"], [accessible="value"], [name="value"], [class="value"]
+    # (single or double quotes) -> @text:value, @accessible:value, ...
+    r'|\[(?P<attr>text|accessible|name|class)=["\'](?P<value>.+)["\']\])$'
+)
+
+# Command params that contain selectors
+_SELECTOR_KEYS = frozenset(("target", "from", "to", "root", "query"))
+
+# Template for command messages; copying it is cheaper than building the
+# dict literal each time
+_COMMAND_SKELETON = {"type": "command", "id": None, "command": None, "params": None}
+# Shared params for commands without any (only ever serialized, never mutated)
+_EMPTY_PARAMS: dict = {}
 
 
+@lru_cache(maxsize=4096)
 def normalize_selector(selector: str) -> str:
     """Convert CSS-like selector syntax to Widgeteer native format.
 
@@ -76,27 +122,58 @@ def normalize_selector(selector: str) -> str:
     if not selector:
         return selector
 
+    # CSS-like segments start with '#', '.' or '['; without any of them the
+    # selector is already native or a plain objectName path
+    if '#' not in selector and '.' not in selector and '[' not in selector:
+        return selector
+
     # Handle hierarchical paths by processing each segment
     if '/' in selector:
-        segments = selector.split('/')
-        normalized = [normalize_selector(seg) for seg in segments]
-        return '/'.join(normalized)
+        return '/'.join(map(_normalize_segment, selector.split('/')))
+
+    return _normalize_segment(selector)
+
 
+def _normalize_segment(segment: str) -> str:
+    """Normalize a single path segment (no '/') to native format."""
     # Already in native format
-    if selector.startswith('@'):
-        return selector
+    if not segment or segment[0] == '@':
+        return segment
 
     # Try CSS-like patterns
-    for pattern, replacement in _SELECTOR_PATTERNS:
-        match = pattern.match(selector)
-        if match:
-            return pattern.sub(replacement, selector)
+    match = _SELECTOR_RE.match(segment)
+    if match:
+        kind = match.lastgroup
+        if kind == 'id':
+            return f'@name:{match["id"]}'
+        if kind == 'cls':
+            return f'@class:{match["cls"]}'
+        return f'@{match["attr"]}:{match["value"]}'
 
     # Return as-is (probably a plain objectName for path segments)
-    return selector
-
-
-@dataclass
+    return segment
+
+
+# Result keys holding a response's primary value, in priority order
+_VALUE_KEY_ORDER = (
+    # Explicit value field (get_property, set_property)
+    "value",
+    # Boolean state checks
+    "exists", "visible", "passed", "enabled",
+    # Collection results
+    "matches", "widgets", "fields",
+    # Screenshot
+    "screenshot",
+    # Method invocation
+    "return",
+    # Action confirmations
+    "clicked", "typed", "focused", "scrolled", "hovered",
+    "waited", "invoked", "dragged", "set",
+)
+_VALUE_KEYS = frozenset(_VALUE_KEY_ORDER)
+
+
+@dataclass(slots=True)
 class Response:
     """Response from Widgeteer server.
 
@@ -132,42 +209,14 @@ class Response:
         if not self.success:
             return None
 
-        # Explicit value field (get_property, set_property)
-        if "value" in self.data:
-            return self.data["value"]
-
-        # Boolean state checks
-        if "exists" in self.data and "visible" not in self.data:
-            return self.data["exists"]
-        if "visible" in self.data:
-            return self.data["visible"]
-        if "passed" in self.data:
-            return self.data["passed"]
-        if "enabled" in self.data:
-            return self.data["enabled"]
-
-        # Collection results
-        if "matches" in self.data:
-            return self.data["matches"]
-        if "widgets" in self.data:
-            return self.data["widgets"]
-        if "fields" in self.data:
-            return self.data["fields"]
-
-        # Screenshot
-        if "screenshot" in self.data:
-            return self.data["screenshot"]
-
-        # Method invocation
-        if "return" in self.data:
-            return self.data["return"]
-
-        # Action confirmations - return True for success
-        action_keys = ("clicked", "typed", "focused", "scrolled", "hovered",
-                       "waited", "invoked", "dragged", "set")
-        for key in action_keys:
-            if key in self.data:
-                return self.data[key]
+        present = _VALUE_KEYS & self.data.keys()
+        if present:
+            for key in _VALUE_KEY_ORDER:
+                if key in present:
+                    # exists() also reports visibility; prefer that
+                    if key == "exists" and "visible" in present:
+                        continue
+                    return self.data[key]
 
         # Fallback: return full data dict
         return self.data
@@ -182,6 +231,8 @@ class Response:
 class WidgeteerError(Exception):
     """Exception raised when a Widgeteer command fails."""
 
+    __slots__ = ("code", "details")
+
     def __init__(self, message: str, code: str | None = None, details: dict | None = None):
         super().__init__(message)
         self.code = code
@@ -193,13 +244,32 @@ class WidgeteerError(Exception):
         return super().__str__()
 
 
-@dataclass
+@dataclass(slots=True)
 class Event:
     """Event from Widgeteer server."""
     event_type: str
     data: dict
 
 
+# Commands built into the Widgeteer server
+_BUILTIN_COMMANDS = (
+    # Introspection
+    "get_tree", "find", "describe", "get_property", "list_properties", "get_actions",
+    "get_form_fields",
+    # Actions
+    "click", "double_click", "right_click", "type", "key", "key_sequence",
+    "drag", "scroll", "hover", "focus",
+    # State
+    "set_property", "set_value", "invoke",
+    # Verification
+    "screenshot", "assert", "exists", "is_visible",
+    # Synchronization
+    "wait", "wait_idle", "wait_signal", "sleep",
+    # Extensibility
+    "call", "list_objects", "list_custom_commands",
+)
+
+
 class WidgeteerClient:
     """Async client for Widgeteer WebSocket API."""
 
@@ -211,13 +281,26 @@ class WidgeteerClient:
         self.port = port
         self.token = token
         self._ws = None
+        # Bound send method of the current connection, set in connect()
+        self._send: Callable[[str], Awaitable[None]] | None = None
         self._pending: dict[str, asyncio.Future] = {}
-        self._event_handlers: dict[str, list[Callable]] = {}
+        # Event handlers per event type, split by kind at subscribe time
+        self._sync_event_handlers: dict[str, list[Callable]] = {}
+        self._async_event_handlers: dict[str, list[Callable]] = {}
         self._receive_task = None
+        # Loop the connection lives on, captured in connect()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        # Message ids only need to be unique within this client's session
+        self._ids = itertools.count(1)
+        # Custom command names, cached by list_commands() until disconnect
+        self._custom_commands: tuple[str, ...] | None = None
 
     def _fail_pending(self, exc: Exception) -> None:
         """Fail all pending command futures immediately."""
-        for future in self._pending.values():
+        # Cleared in place: the receive loop holds a reference to the dict
+        futures = list(self._pending.values())
+        self._pending.clear()
+        for future in futures:
             if not future.done():
                 future.set_exception(exc)
 
@@ -226,16 +309,22 @@ class WidgeteerClient:
         """Build WebSocket URL with optional token."""
         url = f"ws://{self.host}:{self.port}"
         if self.token:
-            url += "?" + urlencode({"token": self.token})
+            url += "?token=" + quote_plus(self.token)
         return url
 
     async def connect(self) -> None:
         """Connect to the WebSocket server."""
-        self._ws = await ws_connect(self.ws_url)
+        self._loop = asyncio.get_running_loop()
+        # Don't offer permessage-deflate: messages are small JSON commands and
+        # compressing each one costs more than it saves. No size cap, since
+        # screenshots and large trees easily exceed the 1 MiB default.
+        self._ws = await ws_connect(self.ws_url, compression=None, max_size=None)
+        self._send = self._ws.send
         self._receive_task = asyncio.create_task(self._receive_loop())
 
     async def disconnect(self) -> None:
         """Disconnect from the server."""
+        self._custom_commands = None
         self._fail_pending(ConnectionError("Disconnected from server"))
         if self._receive_task:
             self._receive_task.cancel()
@@ -249,32 +338,48 @@ class WidgeteerClient:
 
     async def _receive_loop(self) -> None:
         """Background task to receive messages."""
+        recv = partial(self._ws.recv, decode=False) if _RECV_BYTES else self._ws.recv
+        pending = self._pending
         try:
-            async for message in self._ws:
-                data = json.loads(message)
+            while True:
+                try:
+                    message = await recv()
+                except websockets.exceptions.ConnectionClosedOK:
+                    # Clean close: nothing more will arrive for outstanding requests
+                    self._fail_pending(ConnectionError("Connection closed"))
+                    break
+                data = _loads(message)
                 msg_type = data.get("type")
 
                 if msg_type == "response":
                     # Match response to pending request
-                    msg_id = data.get("id")
-                    if msg_id in self._pending:
-                        future = self._pending[msg_id]
-                        if not future.done():
-                            future.set_result(data)
+                    future = pending.pop(data.get("id"), None)
+                    if future is not None and not future.done():
+                        future.set_result(data)
 
                 elif msg_type == "event":
                     # Dispatch to event handlers
                     event_type = data.get("event_type")
-                    event_data = data.get("data", {})
-                    if event_type in self._event_handlers:
-                        for handler in self._event_handlers[event_type]:
-                            try:
-                                if asyncio.iscoroutinefunction(handler):
-                                    await handler(Event(event_type, event_data))
-                                else:
-                                    handler(Event(event_type, event_data))
-                            except Exception as e:
-                                print(f"Event handler error: {e}")
+                    sync_handlers = self._sync_event_handlers.get(event_type)
+                    async_handlers = self._async_event_handlers.get(event_type)
+                    if not (sync_handlers or async_handlers):
+                        continue
+                    # One Event shared by all handlers of this message
+                    event = Event(event_type, data.get("data", {}))
+                    for handler in sync_handlers or ():
+                        try:
+                            handler(event)
+                        except Exception as e:
+                            print(f"Event handler error: {e}")
+                    if async_handlers:
+                        # Run coroutine handlers concurrently
+                        results = await asyncio.gather(
+                            *(handler(event) for handler in async_handlers),
+                            return_exceptions=True,
+                        )
+                        for result in results:
+                            if isinstance(result, Exception):
+                                print(f"Event handler error: {result}")
         except asyncio.CancelledError:
             self._fail_pending(ConnectionError("Connection closed"))
         except Exception as e:
@@ -283,22 +388,28 @@ class WidgeteerClient:
 
     async def _send_and_wait(self, message: dict, timeout: float = 30.0) -> dict:
         """Send a message and wait for response."""
+        msg_id = message.get("id") or str(next(self._ids))
+        message["id"] = msg_id
+        return await self._send_payload_and_wait(msg_id, _dumps(message), timeout)
+
+    async def _send_payload_and_wait(self, msg_id: str, payload: str,
+                                     timeout: float = 30.0) -> dict:
+        """Send an already-encoded message with id msg_id and wait for its response."""
         if not self._ws:
             raise ConnectionError("Not connected to server")
 
-        msg_id = message.get("id") or str(uuid.uuid4())
-        message["id"] = msg_id
-
-        loop = asyncio.get_running_loop()
-        future = loop.create_future()
+        future = self._loop.create_future()
         self._pending[msg_id] = future
 
         try:
-            await self._ws.send(json.dumps(message))
+            await self._send(payload)
             result = await asyncio.wait_for(future, timeout=timeout)
             return result
         finally:
-            self._pending.pop(msg_id, None)
+            # Answered or failed futures were already removed; only a
+            # timed-out (cancelled) or unsent one is still registered
+            if future.cancelled() or not future.done():
+                self._pending.pop(msg_id, None)
 
     async def _send_batch(self, messages: list[dict], timeout: float = 30.0) -> list[dict]:
         """Send multiple messages in parallel and wait for all responses.
@@ -311,39 +422,75 @@ class WidgeteerClient:
         if not messages:
             return []
 
-        loop = asyncio.get_running_loop()
+        pending = self._pending
+        create_future = self._loop.create_future
         futures: list[tuple[str, asyncio.Future]] = []
 
         # Assign IDs and create futures for all messages
         for message in messages:
-            msg_id = message.get("id") or str(uuid.uuid4())
+            msg_id = message.get("id") or str(next(self._ids))
             message["id"] = msg_id
-            future = loop.create_future()
-            self._pending[msg_id] = future
+            future = create_future()
+            pending[msg_id] = future
             futures.append((msg_id, future))
 
+        writer = None
         try:
-            # Send all messages without waiting
-            for message in messages:
-                await self._ws.send(json.dumps(message))
-
-            # Wait for all responses
-            results = await asyncio.wait_for(
-                asyncio.gather(*[f for _, f in futures]),
-                timeout=timeout
+            # Encode everything up front so the sends go out back-to-back
+            payloads = [_dumps(message) for message in messages]
+
+            # Send from a separate task so waiting on responses starts at once;
+            # stop early if a send fails or the connection drops
+            writer = asyncio.create_task(self._send_all(payloads))
+            _, waiting = await asyncio.wait(
+                [writer, *(f for _, f in futures)],
+                timeout=timeout,
+                return_when=asyncio.FIRST_EXCEPTION,
             )
-            return list(results)
+            if writer.done() and not writer.cancelled() and writer.exception():
+                raise writer.exception()
+            # A dropped connection fails the futures while the writer may
+            # still be pending; report that rather than a timeout
+            for _, f in futures:
+                if f.done() and not f.cancelled() and f.exception():
+                    raise f.exception()
+            if waiting:
+                unanswered = sum(1 for _, f in futures if not f.done())
+                raise asyncio.TimeoutError(
+                    f"{unanswered} of {len(futures)} batch responses not received")
+            return [f.result() for _, f in futures]
         finally:
-            # Clean up all pending futures
-            for msg_id, _ in futures:
-                self._pending.pop(msg_id, None)
-
-    def _make_response(self, result: dict) -> Response:
-        """Convert a raw result dict to a Response object."""
-        error_obj = result.get("error", {}) if not result.get("success") else {}
+            if writer and not writer.done():
+                writer.cancel()
+            # Clean up futures still waiting (timeout or send failure), and
+            # mark failures we didn't raise as retrieved
+            for msg_id, future in futures:
+                if not future.done():
+                    future.cancel()
+                    pending.pop(msg_id, None)
+                elif not future.cancelled():
+                    future.exception()
+
+    async def _send_all(self, payloads: list[str]) -> None:
+        """Send encoded messages in order."""
+        send = self._send
+        for payload in payloads:
+            await send(payload)
+
+    def _make_response(self, result: dict, data: dict | None = None) -> Response:
+        """Convert a raw result dict to a Response object.
+
+        data overrides the response data for messages whose payload isn't
+        under "result" (transactions).
+        """
+        if data is None:
+            data = result.get("result", {})
+        if result.get("success"):
+            return Response(True, data, None, None, result.get("duration_ms", 0))
+        error_obj = result.get("error") or {}
         return Response(
-            success=result.get("success", False),
-            data=result.get("result", {}),
+            success=False,
+            data=data,
             error=error_obj.get("message"),
             error_code=error_obj.get("code"),
             duration_ms=result.get("duration_ms", 0)
@@ -361,14 +508,16 @@ class WidgeteerClient:
             [text="OK"]     -> @text:OK
         """
         # Normalize selectors in params
-        normalized_params = self._normalize_params(params) if params else {}
-
-        message = {
-            "type": "command",
-            "id": cmd_id or str(uuid.uuid4()),
-            "command": cmd,
-            "params": normalized_params,
-        }
+        normalized_params = self._normalize_params(params) if params else _EMPTY_PARAMS
+        return await self._send_command(cmd, normalized_params, options, cmd_id, timeout)
+
+    async def _send_command(self, cmd: str, params: dict, options: dict | None = None,
+                            cmd_id: str | None = None, timeout: float = 30.0) -> Response:
+        """Execute a command whose params are already normalized."""
+        message = _COMMAND_SKELETON.copy()
+        message["id"] = cmd_id or str(next(self._ids))
+        message["command"] = cmd
+        message["params"] = params
         if options:
             message["options"] = options
 
@@ -376,19 +525,27 @@ class WidgeteerClient:
         return self._make_response(result)
 
     def _normalize_params(self, params: dict) -> dict:
-        """Normalize selector parameters in a params dict."""
-        result = params.copy()
+        """Normalize selector parameters in a params dict.
 
-        # Keys that contain selectors
-        selector_keys = ("target", "from", "to", "root", "query")
-
-        for key in selector_keys:
-            if key in result and isinstance(result[key], str):
-                result[key] = normalize_selector(result[key])
+        Returns params itself when no selector needs rewriting (no selector
+        keys, or selectors already in native form).
+        """
+        result = params
+        for key in _SELECTOR_KEYS & params.keys():
+            value = params[key]
+            if isinstance(value, str):
+                normalized = normalize_selector(value)
+                # Compare by value: normalize_selector is cached, so an unchanged
+                # selector may come back as an equal string from an earlier call
+                if normalized != value:
+                    if result is params:
+                        result = params.copy()
+                    result[key] = normalized
 
         return result
 
-    async def batch(self, commands: list[dict], timeout: float = 30.0) -> list[Response]:
+    async def batch(self, commands: list[dict], timeout: float = 30.0,
+                    single_frame: bool = False) -> list[Response]:
         """Execute multiple commands in parallel for reduced latency.
 
         All commands are sent before waiting for responses, minimizing round-trip overhead.
@@ -398,6 +555,11 @@ class WidgeteerClient:
             commands: List of command dicts, each with 'command' and 'params' keys.
                       Optional 'options' and 'id' keys are also supported.
             timeout: Timeout for all commands to complete (seconds).
+            single_frame: Send all commands in one command_batch frame and receive
+                          all results in one response frame. Requires a server
+                          that supports command_batch. The response waits for
+                          every command, so leave out commands that open modal
+                          dialogs.
 
         Returns:
             List of Response objects in the same order as input commands.
@@ -412,18 +574,25 @@ class WidgeteerClient:
         """
         messages = []
         for cmd_spec in commands:
-            params = cmd_spec.get("params", {})
-            message = {
-                "type": "command",
-                "id": cmd_spec.get("id") or str(uuid.uuid4()),
-                "command": cmd_spec["command"],
-                "params": self._normalize_params(params) if params else {},
-            }
+            params = cmd_spec.get("params")
+            message = _COMMAND_SKELETON.copy()
+            message["id"] = cmd_spec.get("id") or str(next(self._ids))
+            message["command"] = cmd_spec["command"]
+            message["params"] = self._normalize_params(params) if params else _EMPTY_PARAMS
             if "options" in cmd_spec:
                 message["options"] = cmd_spec["options"]
             messages.append(message)
 
-        results = await self._send_batch(messages, timeout)
+        if single_frame:
+            frame = {"type": "command_batch", "id": str(next(self._ids)), "commands": messages}
+            result = await self._send_and_wait(frame, timeout)
+            if not result.get("success"):
+                error_obj = result.get("error") or {}
+                raise WidgeteerError(error_obj.get("message") or "Batch rejected",
+                                     error_obj.get("code"))
+            results = result.get("results", [])
+        else:
+            results = await self._send_batch(messages, timeout)
         return [self._make_response(r) for r in results]
 
     async def batch_commands(self, *commands: tuple[str, dict | None], timeout: float = 30.0) -> list[Response]:
@@ -444,8 +613,51 @@ class WidgeteerClient:
             )
             print(text1.value, text2.value, visible.value)
         """
-        cmd_list = [{"command": cmd, "params": params or {}} for cmd, params in commands]
-        return await self.batch(cmd_list, timeout)
+        messages = []
+        for cmd, params in commands:
+            message = _COMMAND_SKELETON.copy()
+            message["id"] = str(next(self._ids))
+            message["command"] = cmd
+            message["params"] = self._normalize_params(params) if params else _EMPTY_PARAMS
+            messages.append(message)
+        results = await self._send_batch(messages, timeout)
+        return [self._make_response(r) for r in results]
+
+    def prepare(self, cmd: str, *param_names: str) -> Callable[..., Awaitable[Response]]:
+        """Return a fast sender for repeated calls of one command shape.
+
+        The message envelope is encoded once; each call only encodes its
+        argument values, given positionally in param_names order. Selector
+        params are normalized as usual.
+
+        Example:
+            get_text = client.prepare("get_property", "target", "property")
+            for name in names:
+                resp = await get_text(f"#{name}", "text")
+        """
+        head = '{"type":"command","command":' + _dumps(cmd) + ',"id":"'
+        # Encoded '"name":' with its leading separator, per param
+        keys = [('","params":{' if i == 0 else ',') + _dumps(name) + ':'
+                for i, name in enumerate(param_names)]
+        tail = '}}' if param_names else '","params":{}}'
+        selectors = [name in _SELECTOR_KEYS for name in param_names]
+        count = len(param_names)
+
+        async def send(*args: Any, timeout: float = 30.0) -> Response:
+            if len(args) != count:
+                raise TypeError(f"{cmd} takes {count} arguments ({len(args)} given)")
+            msg_id = str(next(self._ids))
+            parts = [head, msg_id]
+            for key, is_selector, value in zip(keys, selectors, args):
+                if is_selector and isinstance(value, str):
+                    value = normalize_selector(value)
+                parts.append(key)
+                parts.append(_dumps(value))
+            parts.append(tail)
+            result = await self._send_payload_and_wait(msg_id, "".join(parts), timeout)
+            return self._make_response(result)
+
+        return send
 
     # ========== Event Subscriptions ==========
 
@@ -471,50 +683,40 @@ class WidgeteerClient:
                                    filter={"target": "@name:edit", "property": "text"})
             await client.subscribe("focus_changed", on_focus)
         """
-        if event_type not in self._event_handlers:
-            self._event_handlers[event_type] = []
-        self._event_handlers[event_type].append(handler)
+        if asyncio.iscoroutinefunction(handler):
+            handlers = self._async_event_handlers
+        else:
+            handlers = self._sync_event_handlers
+        handlers.setdefault(event_type, []).append(handler)
 
         message = {
             "type": "subscribe",
-            "id": str(uuid.uuid4()),
+            "id": str(next(self._ids)),
             "event_type": event_type,
         }
         if filter:
             message["filter"] = filter
         result = await self._send_and_wait(message)
-
-        error_obj = result.get("error", {}) if not result.get("success") else {}
-        return Response(
-            success=result.get("success", False),
-            data=result.get("result", {}),
-            error=error_obj.get("message"),
-            error_code=error_obj.get("code"),
-        )
+        return self._make_response(result)
 
     async def unsubscribe(self, event_type: str | None = None) -> Response:
         """Unsubscribe from an event type (or all if None)."""
         if event_type:
-            self._event_handlers.pop(event_type, None)
+            self._sync_event_handlers.pop(event_type, None)
+            self._async_event_handlers.pop(event_type, None)
         else:
-            self._event_handlers.clear()
+            self._sync_event_handlers.clear()
+            self._async_event_handlers.clear()
 
         message = {
             "type": "unsubscribe",
-            "id": str(uuid.uuid4()),
+            "id": str(next(self._ids)),
         }
         if event_type:
             message["event_type"] = event_type
 
         result = await self._send_and_wait(message)
-
-        error_obj = result.get("error", {}) if not result.get("success") else {}
-        return Response(
-            success=result.get("success", False),
-            data=result.get("result", {}),
-            error=error_obj.get("message"),
-            error_code=error_obj.get("code"),
-        )
+        return self._make_response(result)
 
     # ========== Recording ==========
 
@@ -522,33 +724,19 @@ class WidgeteerClient:
         """Start recording commands."""
         message = {
             "type": "record_start",
-            "id": str(uuid.uuid4()),
+            "id": str(next(self._ids)),
         }
         result = await self._send_and_wait(message)
-
-        error_obj = result.get("error", {}) if not result.get("success") else {}
-        return Response(
-            success=result.get("success", False),
-            data=result.get("result", {}),
-            error=error_obj.get("message"),
-            error_code=error_obj.get("code"),
-        )
+        return self._make_response(result)
 
     async def stop_recording(self) -> Response:
         """Stop recording and get recorded actions."""
         message = {
             "type": "record_stop",
-            "id": str(uuid.uuid4()),
+            "id": str(next(self._ids)),
         }
         result = await self._send_and_wait(message)
-
-        error_obj = result.get("error", {}) if not result.get("success") else {}
-        return Response(
-            success=result.get("success", False),
-            data=result.get("result", {}),
-            error=error_obj.get("message"),
-            error_code=error_obj.get("code"),
-        )
+        return self._make_response(result)
 
     # ========== Transactions ==========
 
@@ -597,7 +785,7 @@ class WidgeteerClient:
             normalized_steps.append(normalized_step)
 
         message = {
-            "id": str(uuid.uuid4()),
+            "id": str(next(self._ids)),
             "transaction": True,
             "rollback_on_failure": rollback_on_failure,
             "steps": normalized_steps,
@@ -606,17 +794,12 @@ class WidgeteerClient:
         result = await self._send_and_wait(message, timeout)
 
         # Transaction responses have a different structure
-        return Response(
-            success=result.get("success", False),
-            data={
-                "completed_steps": result.get("completed_steps", 0),
-                "total_steps": result.get("total_steps", len(steps)),
-                "steps_results": result.get("steps_results", []),
-                "rollback_performed": result.get("rollback_performed", False),
-            },
-            error=result.get("error", {}).get("message") if not result.get("success") else None,
-            error_code=result.get("error", {}).get("code") if not result.get("success") else None,
-        )
+        return self._make_response(result, data={
+            "completed_steps": result.get("completed_steps", 0),
+            "total_steps": result.get("total_steps", len(steps)),
+            "steps_results": result.get("steps_results", []),
+            "rollback_performed": result.get("rollback_performed", False),
+        })
 
     # ========== Convenience Methods ==========
 
@@ -760,15 +943,27 @@ class WidgeteerClient:
 
     async def get_property(self, target: str, property_name: str) -> Response:
         """Get a property value."""
-        return await self.command("get_property", {
-            "target": target,
+        return await self._send_command("get_property", {
+            "target": normalize_selector(target),
             "property": property_name
         })
 
+    async def get_properties(self, targets: list[str], property_name: str,
+                             timeout: float = 30.0) -> list[Response]:
+        """Get the same property from several widgets in one batch.
+
+        Example:
+            texts = [r.value for r in await client.get_properties(["#edit1", "#edit2"], "text")]
+        """
+        return await self.batch([
+            {"command": "get_property", "params": {"target": target, "property": property_name}}
+            for target in targets
+        ], timeout)
+
     async def set_property(self, target: str, property_name: str, value: Any) -> Response:
         """Set a property value."""
-        return await self.command("set_property", {
-            "target": target,
+        return await self._send_command("set_property", {
+            "target": normalize_selector(target),
             "property": property_name,
             "value": value
         })
@@ -838,42 +1033,36 @@ class WidgeteerClient:
         """
         return await self.command("list_custom_commands", {})
 
-    async def list_commands(self) -> dict:
+    async def list_commands(self, refresh: bool = False) -> dict:
         """List all available commands (built-in and custom).
 
+        Custom command names are fetched once per connection and cached;
+        pass refresh=True to query the server again.
+
         Returns:
             Dict with 'builtin' and 'custom' lists of command names.
         """
-        custom_result = await self.list_custom_commands()
-        custom_cmds = custom_result.data.get("commands", []) if custom_result.success else []
+        custom_cmds = self._custom_commands
+        if custom_cmds is None or refresh:
+            custom_result = await self.list_custom_commands()
+            if custom_result.success:
+                custom_cmds = self._custom_commands = tuple(
+                    custom_result.data.get("commands", []))
+            else:
+                custom_cmds = ()
 
         return {
-            "builtin": [
-                # Introspection
-                "get_tree", "find", "describe", "get_property", "list_properties", "get_actions",
-                "get_form_fields",
-                # Actions
-                "click", "double_click", "right_click", "type", "key", "key_sequence",
-                "drag", "scroll", "hover", "focus",
-                # State
-                "set_property", "set_value", "invoke",
-                # Verification
-                "screenshot", "assert", "exists", "is_visible",
-                # Synchronization
-                "wait", "wait_idle", "wait_signal", "sleep",
-                # Extensibility
-                "call", "list_objects", "list_custom_commands",
-            ],
+            "builtin": list(_BUILTIN_COMMANDS),
             "custom": list(custom_cmds),
         }
 
     async def exists(self, target: str) -> Response:
         """Check if element exists."""
-        return await self.command("exists", {"target": target})
+        return await self._send_command("exists", {"target": normalize_selector(target)})
 
     async def is_visible(self, target: str) -> Response:
         """Check if element is visible."""
-        return await self.command("is_visible", {"target": target})
+        return await self._send_command("is_visible", {"target": normalize_selector(target)})
 
     async def describe(self, target: str) -> Response:
         """Get detailed info about a widget."""
@@ -969,20 +1158,177 @@ class WidgeteerClient:
         await self.disconnect()
 
 
+class CommandPipeline:
+    """Commands queued by SyncWidgeteerClient.pipelined().
+
+    responses is filled in request order as each batch is sent.
+    """
+
+    def __init__(self, send: Callable[[list[dict]], list[Response]],
+                 max_batch: int | None = None):
+        self.commands: list[dict] = []
+        self.responses: list[Response] = []
+        self._send = send
+        self._max_batch = max_batch
+
+    def command(self, cmd: str, params: dict | None = None,
+                options: dict | None = None) -> int:
+        """Queue a command. Returns its index in responses."""
+        spec = {"command": cmd, "params": params or {}}
+        if options:
+            spec["options"] = options
+        self.commands.append(spec)
+        index = len(self.responses) + len(self.commands) - 1
+        if self._max_batch and len(self.commands) >= self._max_batch:
+            self.flush()
+        return index
+
+    def flush(self) -> None:
+        """Send the queued commands now."""
+        if self.commands:
+            commands, self.commands = self.commands, []
+            self.responses.extend(self._send(commands))
+
+
+class _BlockingWidgeteerClient(WidgeteerClient):
+    """WidgeteerClient over a blocking websocket-client connection.
+
+    None of its coroutines suspend, so SyncWidgeteerClient drives them
+    without an event loop. Events are not delivered on this transport.
+    """
+
+    async def connect(self) -> None:
+        self._ws = ws_blocking.create_connection(self.ws_url)
+
+    async def disconnect(self) -> None:
+        self._custom_commands = None
+        if self._ws:
+            self._ws.close()
+            self._ws = None
+
+    async def subscribe(self, event_type: str, handler: Callable[[Event], None],
+                        filter: dict | None = None) -> Response:
+        raise RuntimeError("Event subscriptions require the asyncio transport")
+
+    async def _send_payload_and_wait(self, msg_id: str, payload: str,
+                                     timeout: float = 30.0) -> dict:
+        return self._exchange([msg_id], [payload], timeout)[0]
+
+    async def _send_batch(self, messages: list[dict], timeout: float = 30.0) -> list[dict]:
+        ids = []
+        for message in messages:
+            msg_id = message.get("id") or str(next(self._ids))
+            message["id"] = msg_id
+            ids.append(msg_id)
+        return self._exchange(ids, [_dumps(message) for message in messages], timeout)
+
+    def _exchange(self, ids: list[str], payloads: list[str], timeout: float) -> list[dict]:
+        """Send encoded messages and block until each id has its response."""
+        if not self._ws:
+            raise ConnectionError("Not connected to server")
+
+        for payload in payloads:
+            self._ws.send(payload)
+
+        # Read until every id is answered; anything else (events, late
+        # responses to timed-out requests) is dropped
+        waiting = set(ids)
+        results = {}
+        deadline = time.monotonic() + timeout
+        try:
+            while waiting:
+                self._ws.settimeout(max(deadline - time.monotonic(), 0.001))
+                data = _loads(self._ws.recv())
+                msg_id = data.get("id")
+                if data.get("type") == "response" and msg_id in waiting:
+                    waiting.discard(msg_id)
+                    results[msg_id] = data
+        except ws_blocking.WebSocketTimeoutException:
+            raise asyncio.TimeoutError(
+                f"{len(waiting)} of {len(ids)} responses not received") from None
+        except ws_blocking.WebSocketConnectionClosedException as e:
+            raise ConnectionError("Connection closed") from e
+        return [results[msg_id] for msg_id in ids]
+
+
+def _run_blocking(coro):
+    """Run a coroutine that never suspends, without an event loop."""
+    try:
+        coro.send(None)
+    except StopIteration as stop:
+        return stop.value
+    coro.close()
+    raise RuntimeError("Operation requires the asyncio transport")
+
+
+class _SyncLoops:
+    """Event loops shared by SyncWidgeteerClient instances on one thread.
+
+    The loops are closed when the owning thread exits and its thread-local
+    data is released, or at interpreter exit for the main thread.
+    """
+
+    def __init__(self):
+        self.loops: dict[bool, asyncio.AbstractEventLoop] = {}
+
+    def close(self) -> None:
+        for loop in self.loops.values():
+            if not loop.is_closed():
+                loop.close()
+        self.loops.clear()
+
+    __del__ = close
+
+
+_sync_loops = threading.local()
+
+
+@atexit.register
+def _close_sync_loops() -> None:
+    # atexit runs on the main thread, so this closes the main thread's loops
+    holder = getattr(_sync_loops, "holder", None)
+    if holder is not None:
+        holder.close()
+
+
+def _shared_sync_loop(use_uvloop: bool) -> asyncio.AbstractEventLoop:
+    """Return this thread's shared loop for sync clients, creating it if needed."""
+    holder = getattr(_sync_loops, "holder", None)
+    if holder is None:
+        holder = _sync_loops.holder = _SyncLoops()
+    loop = holder.loops.get(use_uvloop)
+    if loop is None or loop.is_closed():
+        loop = uvloop.new_event_loop() if use_uvloop else asyncio.new_event_loop()
+        holder.loops[use_uvloop] = loop
+    return loop
+
+
 # Synchronous wrapper for simpler use cases
 class SyncWidgeteerClient:
     """Synchronous wrapper for WidgeteerClient.
 
-    This client manages its own event loop for running async operations synchronously.
-    It properly cleans up the loop when closed.
+    Async operations run on an event loop shared by all sync clients on the
+    same thread, so short-lived clients don't each pay for creating a loop.
+
+    With prefer_sync_transport=True and the websocket-client package installed,
+    commands go over a plain blocking socket instead, skipping the event loop
+    entirely. Event subscriptions are not available on that transport.
+
+    The event loop is a uvloop loop when uvloop is installed, unless
+    use_uvloop=False.
 
     Note: Do not use this client from within async code - use WidgeteerClient directly instead.
     """
 
-    def __init__(self, host: str = "localhost", port: int = 9000, token: str | None = None):
-        self._client = WidgeteerClient(host, port, token)
+    def __init__(self, host: str = "localhost", port: int = 9000, token: str | None = None,
+                 prefer_sync_transport: bool = False, use_uvloop: bool = True):
+        self._blocking = prefer_sync_transport and ws_blocking is not None
+        if self._blocking:
+            self._client = _BlockingWidgeteerClient(host, port, token)
+        else:
+            self._client = WidgeteerClient(host, port, token)
         self._loop: asyncio.AbstractEventLoop | None = None
-        self._owns_loop = False
+        self._use_uvloop = use_uvloop and uvloop is not None
 
     def _get_loop(self) -> asyncio.AbstractEventLoop:
         """Get or create an event loop for sync operations."""
@@ -1003,14 +1349,14 @@ class SyncWidgeteerClient:
                 raise
             # No running loop - this is the expected case for sync usage
 
-        # Create a new event loop
-        self._loop = asyncio.new_event_loop()
+        self._loop = _shared_sync_loop(self._use_uvloop)
         asyncio.set_event_loop(self._loop)
-        self._owns_loop = True
         return self._loop
 
     def _run(self, coro):
         """Run a coroutine synchronously."""
+        if self._blocking:
+            return _run_blocking(coro)
         return self._get_loop().run_until_complete(coro)
 
     def connect(self) -> None:
@@ -1025,10 +1371,8 @@ class SyncWidgeteerClient:
         """Close the client and clean up resources."""
         if self._client._ws:
             self._run(self._client.disconnect())
-        if self._owns_loop and self._loop is not None and not self._loop.is_closed():
-            self._loop.close()
-            self._loop = None
-            self._owns_loop = False
+        # The loop is shared with other clients on this thread; leave it open
+        self._loop = None
 
     def command(self, cmd: str, params: dict | None = None, **kwargs) -> Response:
         return self._run(self._client.command(cmd, params, **kwargs))
@@ -1076,6 +1420,10 @@ class SyncWidgeteerClient:
     def get_property(self, target: str, property_name: str) -> Response:
         return self._run(self._client.get_property(target, property_name))
 
+    def get_properties(self, targets: list[str], property_name: str,
+                       timeout: float = 30.0) -> list[Response]:
+        return self._run(self._client.get_properties(targets, property_name, timeout))
+
     def set_property(self, target: str, property_name: str, value: Any) -> Response:
         return self._run(self._client.set_property(target, property_name, value))
 
@@ -1098,9 +1446,9 @@ class SyncWidgeteerClient:
         """List all custom commands registered on the server."""
         return self._run(self._client.list_custom_commands())
 
-    def list_commands(self) -> dict:
+    def list_commands(self, refresh: bool = False) -> dict:
         """List all available commands (built-in and custom)."""
-        return self._run(self._client.list_commands())
+        return self._run(self._client.list_commands(refresh))
 
     def exists(self, target: str) -> Response:
         return self._run(self._client.exists(target))
@@ -1154,7 +1502,8 @@ class SyncWidgeteerClient:
                         value: Any) -> Response:
         return self._run(self._client.assert_property(target, property_name, operator, value))
 
-    def batch(self, commands: list[dict], timeout: float = 30.0) -> list[Response]:
+    def batch(self, commands: list[dict], timeout: float = 30.0,
+              single_frame: bool = False) -> list[Response]:
         """Execute multiple commands in parallel for reduced latency.
 
         Example:
@@ -1164,7 +1513,7 @@ class SyncWidgeteerClient:
             ])
             text, visible = [r.value for r in results]
         """
-        return self._run(self._client.batch(commands, timeout))
+        return self._run(self._client.batch(commands, timeout, single_frame))
 
     def batch_commands(self, *commands: tuple[str, dict | None], timeout: float = 30.0) -> list[Response]:
         """Execute multiple commands in parallel using a simpler API.
@@ -1178,6 +1527,36 @@ class SyncWidgeteerClient:
         """
         return self._run(self._client.batch_commands(*commands, timeout=timeout))
 
+    def prepare(self, cmd: str, *param_names: str) -> Callable[..., Response]:
+        """Return a fast sender for repeated calls of one command shape.
+
+        Example:
+            get_text = client.prepare("get_property", "target", "property")
+            texts = [get_text(f"#{name}", "text").value for name in names]
+        """
+        send = self._client.prepare(cmd, *param_names)
+        return lambda *args, **kwargs: self._run(send(*args, **kwargs))
+
+    @contextmanager
+    def pipelined(self, timeout: float = 30.0, max_batch: int | None = None,
+                  single_frame: bool = False) -> Iterator["CommandPipeline"]:
+        """Collect commands and send them as one batch when the block exits.
+
+        With max_batch, a batch is also sent whenever that many commands
+        are queued. Queued commands are not sent if the block raises.
+        single_frame is passed through to batch().
+
+        Example:
+            with client.pipelined() as pipe:
+                pipe.command("get_property", {"target": "#edit1", "property": "text"})
+                pipe.command("is_visible", {"target": "#dialog"})
+            text, visible = [r.value for r in pipe.responses]
+        """
+        pipe = CommandPipeline(
+            partial(self.batch, timeout=timeout, single_frame=single_frame), max_batch)
+        yield pipe
+        pipe.flush()
+
     def transaction(self, steps: list[dict], rollback_on_failure: bool = True,
                     timeout: float = 60.0) -> Response:
         """Execute multiple commands atomically with optional rollback.